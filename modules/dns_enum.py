@@ -3,16 +3,21 @@ DNS Enumeration Module
 Performs comprehensive DNS enumeration including various record types
 """
 
+import asyncio
+import dns.asyncresolver
 import dns.resolver
 from datetime import datetime
 
+from utils.dns_cache import cached_resolve_async
+
 
 class DNSEnumerator:
     """DNS enumeration and record gathering module"""
     
-    def __init__(self, target, logger):
+    def __init__(self, target, logger, timeout=5):
         self.target = target
         self.logger = logger
+        self.timeout = timeout
         
         # DNS record types to query
         self.record_types = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'SOA', 'CNAME', 'PTR']
@@ -32,9 +37,8 @@ class DNSEnumerator:
             'records': {}
         }
         
-        # Query each record type
-        for record_type in self.record_types:
-            records = self._query_record_type(record_type)
+        # Query all record types concurrently
+        for record_type, records in asyncio.run(self._enumerate_async()):
             if records:
                 results['records'][record_type] = records
                 self.logger.info(f"Found {len(records)} {record_type} record(s)")
@@ -45,12 +49,31 @@ class DNSEnumerator:
         
         return results
     
-    def _query_record_type(self, record_type):
+    async def _enumerate_async(self):
+        """Query all record types concurrently, preserving record type order"""
+        resolver = dns.asyncresolver.Resolver()
+        resolver.lifetime = self.timeout
+        
+        results = await asyncio.gather(
+            *[self._async_query(resolver, record_type) for record_type in self.record_types],
+            return_exceptions=True
+        )
+        
+        enumerated = []
+        for record_type, records in zip(self.record_types, results):
+            if isinstance(records, Exception):
+                self.logger.debug(f"Error querying {record_type} records: {str(records)}")
+                records = []
+            enumerated.append((record_type, records))
+        
+        return enumerated
+    
+    async def _async_query(self, resolver, record_type):
         """Query specific DNS record type"""
         records = []
         
         try:
-            answers = dns.resolver.resolve(self.target, record_type)
+            answers = await cached_resolve_async(resolver, self.target, record_type)
             
             for rdata in answers:
                 record_data = self._parse_record(record_type, rdata)
@@ -69,44 +92,44 @@ class DNSEnumerator:
         return records
     
     def _parse_record(self, record_type, rdata):
-        """Parse DNS record data"""
+        """Parse DNS record data using typed rdata attributes"""
         try:
             if record_type == 'A':
                 return {
                     'type': 'A',
-                    'address': str(rdata)
+                    'address': rdata.address
                 }
             
             elif record_type == 'AAAA':
                 return {
                     'type': 'AAAA',
-                    'address': str(rdata)
+                    'address': rdata.address
                 }
             
             elif record_type == 'MX':
                 return {
                     'type': 'MX',
                     'priority': rdata.preference,
-                    'exchange': str(rdata.exchange)
+                    'exchange': rdata.exchange.to_text()
                 }
             
             elif record_type == 'NS':
                 return {
                     'type': 'NS',
-                    'nameserver': str(rdata)
+                    'nameserver': rdata.target.to_text()
                 }
             
             elif record_type == 'TXT':
                 return {
                     'type': 'TXT',
-                    'text': str(rdata)
+                    'text': b''.join(rdata.strings).decode('utf-8', 'replace')
                 }
             
             elif record_type == 'SOA':
                 return {
                     'type': 'SOA',
-                    'mname': str(rdata.mname),
-                    'rname': str(rdata.rname),
+                    'mname': rdata.mname.to_text(),
+                    'rname': rdata.rname.to_text(),
                     'serial': rdata.serial,
                     'refresh': rdata.refresh,
                     'retry': rdata.retry,
@@ -117,13 +140,13 @@ class DNSEnumerator:
             elif record_type == 'CNAME':
                 return {
                     'type': 'CNAME',
-                    'target': str(rdata)
+                    'target': rdata.target.to_text()
                 }
             
             elif record_type == 'PTR':
                 return {
                     'type': 'PTR',
-                    'ptrdname': str(rdata)
+                    'ptrdname': rdata.target.to_text()
                 }
             
             else:
@@ -3,21 +3,94 @@ Port Scanner Module
 Performs port scanning using nmap integration and custom TCP/UDP scanning
 """
 
+import errno
+import selectors
 import socket
 import subprocess
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import re
+import time
+from collections import deque
 from datetime import datetime
+from itertools import chain
+
+from utils.uring import ConnectRing
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+# Maximum number of probe sockets kept in flight by the custom scanner
+MAX_IN_FLIGHT = 500
+
+# File descriptors left for the rest of the process (DNS, service detection)
+FD_HEADROOM = 64
+
+# How long to wait for descriptors held elsewhere in the process to be freed,
+# and how many such waits in a row before giving up
+FD_RETRY_DELAY = 0.05
+FD_RETRY_ATTEMPTS = 100
+
+# Errors meaning the process or system ran out of file descriptors
+_FD_EXHAUSTED = (errno.EMFILE, errno.ENFILE)
+
+# connect_ex() results meaning a non-blocking connect is still in progress
+_CONNECT_PENDING = (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK)
+
+# Open port entry in nmap grepable output: port/state/protocol/owner/service/
+_NMAP_PORT_PATTERN = re.compile(r'(\d+)/open/(\w+)//([^/]*)/')
+
+# Common service names by port
+_COMMON_PORTS = {
+    20: 'ftp-data', 21: 'ftp', 22: 'ssh', 23: 'telnet',
+    25: 'smtp', 53: 'dns', 80: 'http', 110: 'pop3',
+    143: 'imap', 443: 'https', 445: 'smb', 3306: 'mysql',
+    3389: 'rdp', 5432: 'postgresql', 5900: 'vnc', 8080: 'http-proxy',
+    8443: 'https-alt', 27017: 'mongodb', 6379: 'redis'
+}
+
+
+def _probe_limit():
+    """Number of in-flight probes that fits under the soft RLIMIT_NOFILE"""
+    if resource is None:
+        return MAX_IN_FLIGHT
+    
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return MAX_IN_FLIGHT
+    
+    return max(1, min(MAX_IN_FLIGHT, max(soft // 2, soft - FD_HEADROOM)))
+
+
+def _getservbyport_safe(port):
+    """Look up a service name in the system services database"""
+    try:
+        return socket.getservbyport(port, 'tcp')
+    except OSError:
+        return 'unknown'
 
 
 class PortScanner:
     """Port scanning module with multiple scan types"""
     
-    def __init__(self, target, logger):
+    def __init__(self, target, logger, timeout=1):
         self.target = target
         self.logger = logger
+        self.timeout = timeout
         self.open_ports = []
         
+        # Address used for connects; resolved once per scan
+        self._target_ip = target
+        
+        # Probe sockets kept in flight, bounded by the open file limit
+        self._max_in_flight = _probe_limit()
+        
+        # Cached result of _check_nmap (None until first checked)
+        self._nmap_available = None
+        
     def scan(self, ports="1-1000", scan_type="syn"):
         """
         Main scan method
@@ -31,17 +104,28 @@ class PortScanner:
         """
         self.logger.info(f"Scanning ports {ports} on {self.target} using {scan_type} scan")
         
+        # Resolve once instead of letting every connect do its own lookup
+        try:
+            self._target_ip = socket.gethostbyname(self.target)
+        except OSError:
+            self._target_ip = self.target
+        
+        # Reject malformed or out-of-range port specs before any probe starts
+        self._parse_port_range(ports)
+        
+        has_nmap = self._check_nmap()
+        
         results = {
             'target': self.target,
             'scan_type': scan_type,
             'port_range': ports,
             'timestamp': datetime.now().isoformat(),
             'open_ports': [],
-            'scan_method': 'nmap' if self._check_nmap() else 'custom'
+            'scan_method': 'nmap' if has_nmap else 'custom'
         }
         
         # Try nmap first, fall back to custom scanner
-        if self._check_nmap() and scan_type == "syn":
+        if has_nmap and scan_type == "syn":
             results['open_ports'] = self._nmap_scan(ports)
         else:
             results['open_ports'] = self._custom_scan(ports, scan_type)
@@ -53,12 +137,15 @@ class PortScanner:
     
     def _check_nmap(self):
         """Check if nmap is available"""
-        try:
-            subprocess.run(['nmap', '--version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.logger.warning("nmap not found, using custom scanner")
-            return False
+        if self._nmap_available is None:
+            try:
+                subprocess.run(['nmap', '--version'], capture_output=True, check=True)
+                self._nmap_available = True
+            except (subprocess.CalledProcessError, FileNotFoundError):
+                self.logger.warning("nmap not found, using custom scanner")
+                self._nmap_available = False
+        
+        return self._nmap_available
     
     def _nmap_scan(self, ports):
         """Perform nmap scan"""
@@ -71,13 +158,13 @@ class PortScanner:
                 '-p', ports,
                 '-T4',  # Aggressive timing
                 '--open',  # Only show open ports
-                '-oX', '-',  # XML output to stdout
+                '-oG', '-',  # Grepable output to stdout
                 self.target
             ]
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
             
-            # Parse nmap XML output
+            # Parse nmap grepable output
             return self._parse_nmap_output(result.stdout)
             
         except subprocess.TimeoutExpired:
@@ -87,124 +174,223 @@ class PortScanner:
             self.logger.error(f"nmap scan failed: {str(e)}")
             return []
     
-    def _parse_nmap_output(self, xml_output):
-        """Parse nmap XML output"""
-        import xml.etree.ElementTree as ET
-        
+    def _parse_nmap_output(self, grepable_output):
+        """Parse nmap grepable output"""
         open_ports = []
         
-        try:
-            root = ET.fromstring(xml_output)
+        for line in grepable_output.splitlines():
+            if not line.startswith('Host:'):
+                continue
             
-            for port in root.findall('.//port'):
-                state = port.find('state')
-                if state is not None and state.get('state') == 'open':
-                    port_id = port.get('portid')
-                    protocol = port.get('protocol')
-                    
-                    service = port.find('service')
-                    service_name = service.get('name') if service is not None else 'unknown'
-                    
-                    open_ports.append({
-                        'port': int(port_id),
-                        'protocol': protocol,
-                        'state': 'open',
-                        'service': service_name
-                    })
-            
-        except ET.ParseError as e:
-            self.logger.error(f"Failed to parse nmap output: {str(e)}")
+            for match in _NMAP_PORT_PATTERN.finditer(line):
+                open_ports.append({
+                    'port': int(match.group(1)),
+                    'protocol': match.group(2),
+                    'state': 'open',
+                    'service': match.group(3) or 'unknown'
+                })
         
         return open_ports
     
     def _custom_scan(self, ports, scan_type):
-        """Custom port scanner using raw sockets"""
+        """Custom port scanner using non-blocking sockets and a selector loop"""
         self.logger.info("Using custom port scanner")
         
-        # Parse port range
-        port_list = self._parse_port_range(ports)
+        protocol = 'udp' if scan_type == 'udp' else 'tcp'
         
-        # Scan ports concurrently
+        # Prefer batched io_uring connects for TCP on Linux
+        if protocol == 'tcp':
+            open_ports = self._uring_scan(ports)
+            if open_ports is not None:
+                return open_ports
+        
+        port_iter = self._parse_port_range(ports)
         open_ports = []
         
-        with ThreadPoolExecutor(max_workers=50) as executor:
-            futures = {
-                executor.submit(self._scan_port, port, scan_type): port 
-                for port in port_list
-            }
+        # Ports put back when no file descriptor was free to probe them
+        retry = deque()
+        
+        # Probes in start order; deadlines are therefore monotonic
+        pending = deque()
+        stalls = 0
+        
+        with selectors.DefaultSelector() as sel:
+            ports_left = self._fill_probes(sel, pending, port_iter, retry, protocol, open_ports)
             
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    open_ports.append(result)
-                    self.logger.info(f"Port {result['port']} is open")
+            while pending or ports_left:
+                if pending:
+                    stalls = 0
+                    timeout = max(0, pending[0][0] - time.monotonic())
+                    
+                    for key, _ in sel.select(timeout=timeout):
+                        sock = key.fileobj
+                        sel.unregister(sock)
+                        
+                        if self._probe_succeeded(sock, protocol):
+                            self._record_open(open_ports, key.data, protocol)
+                        sock.close()
+                    
+                    # Expire probes that outlived the timeout
+                    now = time.monotonic()
+                    while pending and (pending[0][1].fileno() == -1 or pending[0][0] <= now):
+                        _, sock = pending.popleft()
+                        if sock.fileno() != -1:
+                            sel.unregister(sock)
+                            sock.close()
+                else:
+                    # Out of descriptors with none of ours in flight; wait for
+                    # the rest of the process to release some
+                    stalls += 1
+                    if stalls > FD_RETRY_ATTEMPTS:
+                        self.logger.error("Out of file descriptors, stopping the scan early")
+                        break
+                    time.sleep(FD_RETRY_DELAY)
+                
+                ports_left = self._fill_probes(sel, pending, port_iter, retry, protocol, open_ports)
         
         return sorted(open_ports, key=lambda x: x['port'])
     
-    def _parse_port_range(self, ports):
-        """Parse port range string into list of ports"""
-        port_list = []
+    def _uring_scan(self, ports):
+        """
+        TCP connect scan using io_uring
         
-        for part in ports.split(','):
-            if '-' in part:
-                start, end = map(int, part.split('-'))
-                port_list.extend(range(start, end + 1))
-            else:
-                port_list.append(int(part))
+        Returns:
+            list: Open ports, or None if io_uring is unavailable
+        """
+        try:
+            ring = ConnectRing(entries=self._max_in_flight * 2)
+        except (OSError, AttributeError) as e:
+            self.logger.debug(f"io_uring unavailable, using selector scan: {str(e)}")
+            return None
         
-        return port_list
-    
-    def _scan_port(self, port, scan_type):
-        """Scan a single port"""
         try:
-            if scan_type in ['tcp', 'syn']:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)
-                
-                result = sock.connect_ex((self.target, port))
+            with ring:
+                found = ring.connect_scan(self._target_ip, self._parse_port_range(ports), self.timeout)
+        except OSError as e:
+            self.logger.debug(f"io_uring scan failed, using selector scan: {str(e)}")
+            return None
+        
+        open_ports = []
+        for port in sorted(found):
+            self._record_open(open_ports, port, 'tcp')
+        
+        return open_ports
+    
+    def _fill_probes(self, sel, pending, port_iter, retry, protocol, open_ports):
+        """
+        Start probes until the in-flight limit is reached
+        
+        Returns:
+            bool: False once every port has been probed
+        """
+        in_flight = len(sel.get_map())
+        
+        while in_flight < self._max_in_flight:
+            port = retry.popleft() if retry else next(port_iter, None)
+            if port is None:
+                return False
+            
+            try:
+                sock, events = self._start_probe(port, protocol)
+            except OSError as e:
+                if e.errno in _FD_EXHAUSTED:
+                    # Requeue the port and wait for in-flight probes to drain
+                    retry.appendleft(port)
+                    return True
+                self.logger.debug(f"Could not probe port {port}: {str(e)}")
+                continue
+            
+            if sock is None:
+                # Connect finished immediately
+                if events:
+                    self._record_open(open_ports, port, protocol)
+                continue
+            
+            sel.register(sock, events, port)
+            pending.append((time.monotonic() + self.timeout, sock))
+            in_flight += 1
+        
+        return True
+    
+    def _start_probe(self, port, protocol):
+        """
+        Start a non-blocking probe
+        
+        Returns:
+            tuple: (socket, selector events) for a pending probe, or
+                   (None, is_open) when the result is already known
+        """
+        if protocol == 'tcp':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            
+            try:
+                result = sock.connect_ex((self._target_ip, port))
+            except OSError:
                 sock.close()
-                
-                if result == 0:
-                    return {
-                        'port': port,
-                        'protocol': 'tcp',
-                        'state': 'open',
-                        'service': self._get_service_name(port)
-                    }
+                raise
             
-            elif scan_type == 'udp':
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(1)
-                
-                try:
-                    sock.sendto(b'', (self.target, port))
-                    sock.recvfrom(1024)
-                    sock.close()
-                    
-                    return {
-                        'port': port,
-                        'protocol': 'udp',
-                        'state': 'open',
-                        'service': self._get_service_name(port)
-                    }
-                except socket.timeout:
-                    # UDP port might be open (no response)
-                    sock.close()
-                    return None
-                
-        except Exception:
-            pass
+            if result in _CONNECT_PENDING:
+                return sock, selectors.EVENT_WRITE
+            
+            sock.close()
+            return None, result == 0
+        
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        
+        try:
+            # Connected UDP sockets surface ICMP port unreachable as errors
+            sock.connect((self._target_ip, port))
+            sock.send(b'')
+        except OSError:
+            sock.close()
+            raise
+        
+        return sock, selectors.EVENT_READ
+    
+    def _probe_succeeded(self, sock, protocol):
+        """Check a probe socket reported ready by the selector"""
+        if protocol == 'tcp':
+            return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        
+        try:
+            sock.recv(1024)
+            return True
+        except OSError:
+            return False
+    
+    def _record_open(self, open_ports, port, protocol):
+        """Record an open port"""
+        open_ports.append({
+            'port': port,
+            'protocol': protocol,
+            'state': 'open',
+            'service': self._get_service_name(port)
+        })
+        self.logger.info(f"Port {port} is open")
+    
+    def _parse_port_range(self, ports):
+        """Parse port range string into a lazy iterator of ports"""
+        # Ranges are validated up front but never materialized as lists
+        port_ranges = []
         
-        return None
+        for part in ports.split(','):
+            try:
+                if '-' in part:
+                    start, end = map(int, part.split('-'))
+                else:
+                    start = end = int(part)
+            except ValueError:
+                raise ValueError(f"Invalid port specification: {part!r}") from None
+            
+            if not (1 <= start <= 65535 and 1 <= end <= 65535):
+                raise ValueError(f"Ports must be between 1 and 65535: {part!r}")
+            
+            port_ranges.append(range(start, end + 1))
+        
+        return chain.from_iterable(port_ranges)
     
     def _get_service_name(self, port):
         """Get common service name for port"""
-        common_ports = {
-            20: 'ftp-data', 21: 'ftp', 22: 'ssh', 23: 'telnet',
-            25: 'smtp', 53: 'dns', 80: 'http', 110: 'pop3',
-            143: 'imap', 443: 'https', 445: 'smb', 3306: 'mysql',
-            3389: 'rdp', 5432: 'postgresql', 5900: 'vnc', 8080: 'http-proxy',
-            8443: 'https-alt', 27017: 'mongodb', 6379: 'redis'
-        }
-        
-        return common_ports.get(port, 'unknown')
+        return _COMMON_PORTS.get(port) or _getservbyport_safe(port)
@@ -3,19 +3,50 @@ Service Detection Module
 Detects services running on open ports using banner grabbing and fingerprinting
 """
 
+import select
 import socket
 import ssl
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
+# Maximum number of ports probed concurrently
+MAX_WORKERS = 32
+
+# How long to wait for a service that speaks first (SSH, SMTP, FTP)
+GREETING_TIMEOUT = 0.3
+
+# How long to wait for a reply after sending a probe
+PROBE_TIMEOUT = 1.5
+
+# Ports checked when no port list is given
+DEFAULT_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 445, 3306, 3389, 5432, 8080, 8443]
+
+# Shared TLS context for HTTPS banner grabs; certificates are not verified
+_SSL_CTX = ssl.create_default_context()
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+
 class ServiceDetector:
     """Service detection and banner grabbing module"""
     
+    # Common version patterns, compiled once
+    _VERSION_PATTERNS = [re.compile(pattern) for pattern in (
+        r'(\d+\.\d+\.\d+)',  # x.x.x
+        r'(\d+\.\d+)',        # x.x
+        r'[vV]ersion[:\s]+([^\s]+)',
+        r'[vV]([0-9.]+)',
+    )]
+    
     def __init__(self, target, logger):
         self.target = target
         self.logger = logger
         
+        # Address used for connects; the hostname is kept for SNI and Host
+        self._target_ip = target
+        
     def detect(self, ports=None):
         """
         Detect services on specified ports
@@ -27,21 +58,29 @@ class ServiceDetector:
             dict: Service detection results
         """
         if ports is None:
-            ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 445, 3306, 3389, 5432, 8080, 8443]
+            ports = DEFAULT_PORTS
         
         self.logger.info(f"Detecting services on {len(ports)} ports")
         
+        # Resolve once instead of letting every connect do its own lookup
+        try:
+            self._target_ip = socket.gethostbyname(self.target)
+        except OSError:
+            self._target_ip = self.target
+        
         results = {
             'target': self.target,
             'timestamp': datetime.now().isoformat(),
             'services': []
         }
         
-        for port in ports:
-            service_info = self._detect_service(port)
-            if service_info:
-                results['services'].append(service_info)
-                self.logger.info(f"Detected {service_info['service']} on port {port}")
+        # Probe ports concurrently; map() keeps results in port order
+        if ports:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(ports))) as executor:
+                for service_info in executor.map(self._detect_service, ports):
+                    if service_info:
+                        results['services'].append(service_info)
+                        self.logger.info(f"Detected {service_info['service']} on port {service_info['port']}")
         
         results['total_services'] = len(results['services'])
         
@@ -50,13 +89,13 @@ class ServiceDetector:
     def _detect_service(self, port):
         """Detect service on a specific port"""
         try:
-            # Check if port is open
-            if not self._is_port_open(port):
+            # Connect and get banner in one round trip; a failed connect
+            # (refused, timed out, unreachable) means the port is closed
+            try:
+                banner = self._grab_banner(port)
+            except OSError:
                 return None
             
-            # Get banner
-            banner = self._grab_banner(port)
-            
             # Analyze banner
             service_info = {
                 'port': port,
@@ -72,47 +111,54 @@ class ServiceDetector:
             self.logger.debug(f"Error detecting service on port {port}: {str(e)}")
             return None
     
-    def _is_port_open(self, port):
-        """Check if port is open"""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex((self.target, port))
-            sock.close()
-            return result == 0
-        except:
-            return False
-    
     def _grab_banner(self, port):
-        """Grab banner from service"""
+        """
+        Connect to port and grab banner from service
+        
+        Raises:
+            OSError: If the connection fails (port closed or filtered)
+        """
         banner = ""
         
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(1.5)
+        
         try:
-            # Try standard banner grab
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(3)
-            sock.connect((self.target, port))
+            sock.connect((self._target_ip, port))
+        except OSError:
+            sock.close()
+            raise
+        
+        try:
+            sock.settimeout(2.0)
             
-            # For HTTP/HTTPS, send HTTP request
-            if port in [80, 8080, 8000, 8888]:
-                sock.send(b"GET / HTTP/1.1\r\nHost: " + self.target.encode() + b"\r\n\r\n")
-            elif port in [443, 8443]:
+            if port in [443, 8443]:
                 # Wrap with SSL for HTTPS
-                context = ssl.create_default_context()
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                
-                with context.wrap_socket(sock, server_hostname=self.target) as ssock:
+                with _SSL_CTX.wrap_socket(sock, server_hostname=self.target) as ssock:
                     ssock.send(b"GET / HTTP/1.1\r\nHost: " + self.target.encode() + b"\r\n\r\n")
                     banner = ssock.recv(1024).decode('utf-8', errors='ignore')
                     return banner
             
+            if port in [80, 8080, 8000, 8888]:
+                # HTTP servers never speak first, send the request right away
+                sock.send(b"GET / HTTP/1.1\r\nHost: " + self.target.encode() + b"\r\n\r\n")
+                readable, _, _ = select.select([sock], [], [], PROBE_TIMEOUT)
+            else:
+                # Give services that greet first a short window, then nudge
+                # quiet ones instead of sitting out the full timeout
+                readable, _, _ = select.select([sock], [], [], GREETING_TIMEOUT)
+                if not readable:
+                    sock.send(b"\r\n")
+                    readable, _, _ = select.select([sock], [], [], PROBE_TIMEOUT)
+            
             # Receive banner
-            banner = sock.recv(1024).decode('utf-8', errors='ignore')
-            sock.close()
+            if readable:
+                banner = sock.recv(1024).decode('utf-8', errors='ignore')
             
         except Exception as e:
             self.logger.debug(f"Banner grab failed for port {port}: {str(e)}")
+        finally:
+            sock.close()
         
         return banner.strip()
     
@@ -169,19 +215,11 @@ class ServiceDetector:
         if not banner:
             return 'Unknown'
         
-        # Common version patterns
-        patterns = [
-            r'(\d+\.\d+\.\d+)',  # x.x.x
-            r'(\d+\.\d+)',        # x.x
-            r'[vV]ersion[:\s]+([^\s]+)',
-            r'[vV]([0-9.]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, banner)
+        for pattern in self._VERSION_PATTERNS:
+            match = pattern.search(banner)
             if match:
                 return match.group(1)
         
         # Return first line of banner if no version found
-        first_line = banner.split('\n')[0][:50]
+        first_line = banner.split('\n', 1)[0][:50]
         return first_line if first_line else 'Unknown'
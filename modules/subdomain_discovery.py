@@ -3,12 +3,44 @@ Subdomain Discovery Module
 Discovers subdomains using DNS enumeration, brute force, and online sources
 """
 
-import socket
+import asyncio
+import dns.asyncresolver
+import dns.exception
+import dns.query
 import dns.resolver
+import dns.zone
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    import orjson as json_parser
+except ImportError:
+    import json as json_parser
+
+from utils.dns_cache import cached_resolve, cached_resolve_async
+
+
+# Maximum number of in-flight DNS queries
+MAX_CONCURRENT_QUERIES = 200
+
+# Per-query DNS timeout (seconds)
+QUERY_TIMEOUT = 2.0
+
+# Default common subdomains
+DEFAULT_SUBDOMAINS = [
+    'www', 'mail', 'ftp', 'localhost', 'webmail', 'smtp', 'pop', 'ns1', 'ns2',
+    'webdisk', 'ns', 'cpanel', 'whm', 'autodiscover', 'autoconfig', 'mx', 'mx1',
+    'mx2', 'imap', 'pop3', 'admin', 'portal', 'api', 'dev', 'staging', 'test',
+    'vpn', 'remote', 'blog', 'shop', 'store', 'mobile', 'm', 'cdn', 'static',
+    'assets', 'img', 'images', 'video', 'media', 'download', 'downloads', 'app',
+    'apps', 'cloud', 'secure', 'login', 'sso', 'auth', 'support', 'help', 'docs',
+    'documentation', 'wiki', 'forum', 'community', 'chat', 'beta', 'alpha', 'demo'
+]
+
+# Shared keep-alive HTTP session for certificate transparency lookups
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'Spotter'})
+
 
 class SubdomainDiscovery:
     """Subdomain discovery and enumeration module"""
@@ -34,89 +66,108 @@ class SubdomainDiscovery:
             'target': self.target,
             'timestamp': datetime.now().isoformat(),
             'subdomains': [],
-            'methods_used': []
+            'methods_used': ['brute_force', 'zone_transfer', 'cert_transparency']
         }
         
-        # Method 1: Common subdomains brute force
-        self.logger.info("Brute forcing common subdomains...")
-        results['methods_used'].append('brute_force')
-        self._brute_force_subdomains(wordlist)
-        
-        # Method 2: DNS zone transfer attempt
-        self.logger.info("Attempting DNS zone transfer...")
-        results['methods_used'].append('zone_transfer')
-        self._attempt_zone_transfer()
-        
-        # Method 3: Certificate transparency logs
-        self.logger.info("Checking certificate transparency logs...")
-        results['methods_used'].append('cert_transparency')
-        self._check_cert_transparency()
+        # Run all discovery methods concurrently, then resolve what they found
+        subdomains, ip_map = asyncio.run(self._discover_async(wordlist))
         
         # Compile results
-        for subdomain in sorted(self.found_subdomains):
-            ip_address = self._resolve_subdomain(subdomain)
-            results['subdomains'].append({
-                'subdomain': subdomain,
-                'ip_address': ip_address
-            })
+        results['subdomains'] = [
+            {'subdomain': subdomain, 'ip_address': ip_map[subdomain]}
+            for subdomain in subdomains
+        ]
         
         results['total_found'] = len(results['subdomains'])
         self.logger.success(f"Found {results['total_found']} subdomains")
         
         return results
     
-    def _brute_force_subdomains(self, wordlist=None):
-        """Brute force subdomains using wordlist"""
-        # Default common subdomains
-        default_subdomains = [
-            'www', 'mail', 'ftp', 'localhost', 'webmail', 'smtp', 'pop', 'ns1', 'ns2',
-            'webdisk', 'ns', 'cpanel', 'whm', 'autodiscover', 'autoconfig', 'mx', 'mx1',
-            'mx2', 'imap', 'pop3', 'admin', 'portal', 'api', 'dev', 'staging', 'test',
-            'vpn', 'remote', 'blog', 'shop', 'store', 'mobile', 'm', 'cdn', 'static',
-            'assets', 'img', 'images', 'video', 'media', 'download', 'downloads', 'app',
-            'apps', 'cloud', 'secure', 'login', 'sso', 'auth', 'support', 'help', 'docs',
-            'documentation', 'wiki', 'forum', 'community', 'chat', 'beta', 'alpha', 'demo'
-        ]
+    async def _discover_async(self, wordlist):
+        """Run brute force, zone transfer and CT checks concurrently"""
+        loop = asyncio.get_running_loop()
+        
+        # Method 1: Common subdomains brute force
+        self.logger.info("Brute forcing common subdomains...")
+        brute_force = self._brute_force_async(self._iter_words(wordlist))
+        
+        # Method 2: DNS zone transfer attempt (blocking, runs in a worker thread)
+        self.logger.info("Attempting DNS zone transfer...")
+        zone_transfer = loop.run_in_executor(None, self._attempt_zone_transfer)
+        
+        # Method 3: Certificate transparency logs (blocking, runs in a worker thread)
+        self.logger.info("Checking certificate transparency logs...")
+        cert_transparency = loop.run_in_executor(None, self._check_cert_transparency)
         
-        # Load wordlist if provided
+        # Each method returns its own set; union them once all are done
+        for found in await asyncio.gather(brute_force, zone_transfer, cert_transparency):
+            self.found_subdomains |= found
+        
+        # Resolve every subdomain concurrently
+        subdomains = sorted(self.found_subdomains)
+        return subdomains, await self._resolve_all(subdomains)
+    
+    def _iter_words(self, wordlist=None):
+        """Stream subdomain names from wordlist without loading it into memory"""
         if wordlist:
             try:
-                with open(wordlist, 'r') as f:
-                    subdomains = [line.strip() for line in f if line.strip()]
+                f = open(wordlist, 'r', buffering=1 << 20)
             except Exception as e:
                 self.logger.warning(f"Failed to load wordlist: {str(e)}, using defaults")
-                subdomains = default_subdomains
-        else:
-            subdomains = default_subdomains
-        
-        # Test subdomains concurrently
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            futures = {
-                executor.submit(self._test_subdomain, sub): sub 
-                for sub in subdomains
-            }
+            else:
+                with f:
+                    for line in f:
+                        word = line.strip()
+                        if word:
+                            yield word
+                return
+        
+        yield from DEFAULT_SUBDOMAINS
+    
+    async def _brute_force_async(self, subdomains):
+        """Brute force subdomains concurrently using the async resolver"""
+        resolver = dns.asyncresolver.Resolver()
+        resolver.lifetime = QUERY_TIMEOUT
+        
+        # Bounded producer/consumer: at most MAX_CONCURRENT_QUERIES names are
+        # in flight, so memory stays O(concurrency) rather than O(wordlist)
+        found = set()
+        pending = set()
+        
+        for subdomain in subdomains:
+            if len(pending) >= MAX_CONCURRENT_QUERIES:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                found.update(task.result() for task in done)
             
-            for future in as_completed(futures):
-                subdomain = future.result()
-                if subdomain:
-                    self.found_subdomains.add(subdomain)
-                    self.logger.info(f"Found subdomain: {subdomain}")
+            pending.add(asyncio.ensure_future(self._test_subdomain(resolver, subdomain)))
+        
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            found.update(task.result() for task in done)
+        
+        found.discard(None)
+        return found
     
-    def _test_subdomain(self, subdomain):
+    async def _test_subdomain(self, resolver, subdomain):
         """Test if subdomain exists"""
         full_domain = f"{subdomain}.{self.target}"
         
         try:
-            socket.gethostbyname(full_domain)
-            return full_domain
-        except socket.gaierror:
+            # Each candidate is asked for once, so a miss is not worth caching
+            await cached_resolve_async(resolver, full_domain, 'A', cache_negative=False)
+        except dns.exception.DNSException:
             return None
+        
+        self.logger.info(f"Found subdomain: {full_domain}")
+        return full_domain
     
     def _attempt_zone_transfer(self):
         """Attempt DNS zone transfer (AXFR)"""
+        found = set()
+        
         try:
             # Get nameservers
-            ns_records = dns.resolver.resolve(self.target, 'NS')
+            ns_records = cached_resolve(self.target, 'NS')
             
             for ns in ns_records:
                 ns_address = str(ns)
@@ -127,7 +178,7 @@ class SubdomainDiscovery:
                     
                     for name in zone.nodes.keys():
                         subdomain = f"{name}.{self.target}"
-                        self.found_subdomains.add(subdomain)
+                        found.add(subdomain)
                         self.logger.success(f"Zone transfer successful! Found: {subdomain}")
                         
                 except Exception as e:
@@ -135,34 +186,51 @@ class SubdomainDiscovery:
                     
         except Exception as e:
             self.logger.debug(f"Could not get nameservers: {str(e)}")
+        
+        return found
     
     def _check_cert_transparency(self):
         """Check certificate transparency logs"""
+        found = set()
+        
         try:
             url = f"https://crt.sh/?q=%.{self.target}&output=json"
-            response = requests.get(url, timeout=10)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                for entry in data:
-                    name_value = entry.get('name_value', '')
+            with _SESSION.get(url, timeout=10, stream=True) as response:
+                if response.status_code == 200:
+                    # Parse the raw body directly, skipping the .text decode
+                    data = json_parser.loads(response.raw.read(decode_content=True))
+                    
+                    # Parse subdomains from certificates, keeping valid ones
+                    found = {
+                        subdomain
+                        for entry in data
+                        for subdomain in map(str.strip, entry.get('name_value', '').split('\n'))
+                        if subdomain.endswith(self.target) and '*' not in subdomain
+                    }
                     
-                    # Parse subdomains from certificate
-                    for subdomain in name_value.split('\n'):
-                        subdomain = subdomain.strip()
-                        
-                        # Filter valid subdomains
-                        if subdomain.endswith(self.target) and '*' not in subdomain:
-                            self.found_subdomains.add(subdomain)
-                            
         except Exception as e:
             self.logger.debug(f"Certificate transparency check failed: {str(e)}")
+        
+        return found
     
-    def _resolve_subdomain(self, subdomain):
-        """Resolve subdomain to IP address"""
-        try:
-            ip_address = socket.gethostbyname(subdomain)
-            return ip_address
-        except:
-            return 'N/A'
+    async def _resolve_all(self, subdomains):
+        """Resolve subdomains to IP addresses concurrently"""
+        resolver = dns.asyncresolver.Resolver()
+        resolver.lifetime = QUERY_TIMEOUT
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        
+        answers = await asyncio.gather(
+            *[self._resolve_subdomain(resolver, semaphore, sub) for sub in subdomains],
+            return_exceptions=True
+        )
+        
+        return {
+            subdomain: 'N/A' if isinstance(answer, Exception) else answer[0].address
+            for subdomain, answer in zip(subdomains, answers)
+        }
+    
+    async def _resolve_subdomain(self, resolver, semaphore, subdomain):
+        """Resolve subdomain A record"""
+        async with semaphore:
+            return await cached_resolve_async(resolver, subdomain, 'A')
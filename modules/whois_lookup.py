@@ -3,8 +3,17 @@ WHOIS Lookup Module
 Performs WHOIS lookups to gather domain registration information
 """
 
+import requests
 import whois
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+# RDAP bootstrap redirector; forwards to the registry's own RDAP server
+RDAP_URL = "https://rdap.org/domain/{}"
+
+# Shared keep-alive HTTP session for RDAP queries
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept': 'application/rdap+json', 'User-Agent': 'Spotter'})
 
 
 class WhoisLookup:
@@ -16,7 +25,7 @@ class WhoisLookup:
         
     def lookup(self):
         """
-        Perform WHOIS lookup
+        Perform WHOIS lookup, preferring RDAP and falling back to WHOIS
         
         Returns:
             dict: WHOIS information
@@ -29,6 +38,16 @@ class WhoisLookup:
             'whois_data': {}
         }
         
+        try:
+            results['whois_data'] = self._rdap_lookup()
+            results['source'] = 'rdap'
+            
+            self.logger.success(f"WHOIS lookup completed for {self.target}")
+            return results
+            
+        except Exception as e:
+            self.logger.debug(f"RDAP lookup failed: {str(e)}, falling back to WHOIS")
+        
         try:
             w = whois.whois(self.target)
             
@@ -49,6 +68,7 @@ class WhoisLookup:
                 'country': self._safe_get(w, 'country'),
                 'registrant_postal_code': self._safe_get(w, 'registrant_postal_code'),
             }
+            results['source'] = 'whois'
             
             self.logger.success(f"WHOIS lookup completed for {self.target}")
             
@@ -58,6 +78,113 @@ class WhoisLookup:
         
         return results
     
+    def _rdap_lookup(self):
+        """Query RDAP and map the JSON response onto the WHOIS result schema"""
+        response = _SESSION.get(RDAP_URL.format(self.target), timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        
+        events = {event.get('eventAction'): event.get('eventDate') for event in data.get('events', [])}
+        
+        registrar = {}
+        registrant = {}
+        emails = []
+        
+        for entity in self._iter_entities(data):
+            vcard = self._parse_vcard(entity)
+            roles = entity.get('roles', [])
+            
+            if 'registrar' in roles and not registrar:
+                registrar = vcard
+            if 'registrant' in roles and not registrant:
+                registrant = vcard
+            
+            for email in vcard.get('email', []):
+                if email not in emails:
+                    emails.append(email)
+        
+        address = self._first(registrant.get('adr'))
+        
+        return {
+            'domain_name': data.get('ldhName'),
+            'registrar': self._first(registrar.get('fn')),
+            'creation_date': self._rdap_date(events.get('registration')),
+            'expiration_date': self._rdap_date(events.get('expiration')),
+            'updated_date': self._rdap_date(events.get('last changed')),
+            'name_servers': self._unwrap([ns.get('ldhName') for ns in data.get('nameservers', [])]),
+            'status': self._unwrap(data.get('status', [])),
+            'emails': self._unwrap(emails),
+            'org': self._first(registrant.get('org')),
+            'address': self._adr_field(address, 2),
+            'city': self._adr_field(address, 3),
+            'state': self._adr_field(address, 4),
+            'country': self._adr_field(address, 6),
+            'registrant_postal_code': self._adr_field(address, 5),
+        }
+    
+    def _rdap_date(self, value):
+        """Normalize an RDAP timestamp to the naive UTC form _format_date gives WHOIS dates"""
+        if not value:
+            return None
+        
+        try:
+            # fromisoformat only accepts a "Z" suffix from Python 3.11 on
+            date_value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return str(value)
+        
+        if date_value.tzinfo is not None:
+            date_value = date_value.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        return self._format_date(date_value)
+    
+    def _iter_entities(self, obj):
+        """Yield RDAP entities, including nested ones, depth first"""
+        for entity in obj.get('entities', []):
+            yield entity
+            yield from self._iter_entities(entity)
+    
+    def _parse_vcard(self, entity):
+        """Convert an entity's jCard into a {property: [values]} dict"""
+        vcard = {}
+        
+        try:
+            properties = entity.get('vcardArray', [None, []])[1]
+        except (IndexError, TypeError):
+            return vcard
+        
+        for prop in properties:
+            if len(prop) >= 4:
+                vcard.setdefault(prop[0], []).append(prop[3])
+        
+        return vcard
+    
+    def _adr_field(self, address, index):
+        """
+        Get a component of a vCard adr value
+        
+        adr is [pobox, extended, street, locality, region, postal code, country];
+        components may themselves be lists
+        """
+        if not isinstance(address, list) or index >= len(address):
+            return None
+        
+        value = address[index]
+        if isinstance(value, list):
+            value = ', '.join(part for part in value if part)
+        
+        return value or None
+    
+    def _first(self, values):
+        """Return the first value of a vCard property list"""
+        return values[0] if values else None
+    
+    def _unwrap(self, values):
+        """Collapse lists the same way _safe_get does for WHOIS objects"""
+        if not values:
+            return None
+        return values[0] if len(values) == 1 else values
+    
     def _safe_get(self, whois_obj, key):
         """Safely get attribute from WHOIS object"""
         try:
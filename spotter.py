@@ -7,22 +7,29 @@ A CLI-based automated enumeration and scanning tool
 import argparse
 import sys
 import os
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style, init
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+# Initialize colorama for cross-platform colored output, stripping the codes
+# when output is redirected to a file or pipe
+init(autoreset=True, strip=(not sys.stdout.isatty()) or None)
 
-# Import modules
-from modules.port_scanner import PortScanner
-from modules.service_detector import ServiceDetector
-from modules.subdomain_discovery import SubdomainDiscovery
-from modules.whois_lookup import WhoisLookup
-from modules.dns_enum import DNSEnumerator
+# Import utilities; recon modules are imported inside their run_* methods so
+# only the selected ones pay their import cost
 from utils.logger import Logger
 from utils.output_handler import OutputHandler
 from utils.banner import print_banner
 
+
+# Characters in a target that cannot appear in a results filename
+_FNAME_TRANS = str.maketrans({'.': '_', '/': '_', ':': '_'})
+
+# Order of the module sections in saved reports
+_RESULT_ORDER = ('whois', 'dns_enumeration', 'port_scan', 'service_detection', 'subdomain_discovery')
+
+
 class Spotter:
     """Main Spotter reconnaissance framework class"""
     
@@ -32,74 +39,121 @@ class Spotter:
         self.verbose = verbose
         self.logger = Logger(verbose=verbose)
         self.results = {}
+        self._results_lock = threading.Lock()
         
         # Create output directory if it doesn't exist
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
             
     def run_port_scan(self, ports="1-1000", scan_type="syn"):
         """Execute port scanning module"""
+        from modules.port_scanner import PortScanner
+        
         self.logger.info(f"Starting port scan on {self.target}")
         scanner = PortScanner(self.target, self.logger)
         results = scanner.scan(ports=ports, scan_type=scan_type)
-        self.results['port_scan'] = results
+        with self._results_lock:
+            self.results['port_scan'] = results
         return results
     
     def run_service_detection(self, ports=None):
         """Execute service detection module"""
+        from modules.service_detector import ServiceDetector
+        
         self.logger.info(f"Starting service detection on {self.target}")
         detector = ServiceDetector(self.target, self.logger)
         results = detector.detect(ports=ports)
-        self.results['service_detection'] = results
+        with self._results_lock:
+            self.results['service_detection'] = results
         return results
     
     def run_subdomain_discovery(self, wordlist=None):
         """Execute subdomain discovery module"""
+        from modules.subdomain_discovery import SubdomainDiscovery
+        
         self.logger.info(f"Starting subdomain discovery for {self.target}")
         discovery = SubdomainDiscovery(self.target, self.logger)
         results = discovery.discover(wordlist=wordlist)
-        self.results['subdomain_discovery'] = results
+        with self._results_lock:
+            self.results['subdomain_discovery'] = results
         return results
     
     def run_whois_lookup(self):
         """Execute WHOIS lookup module"""
+        from modules.whois_lookup import WhoisLookup
+        
         self.logger.info(f"Starting WHOIS lookup for {self.target}")
         whois_lookup = WhoisLookup(self.target, self.logger)
         results = whois_lookup.lookup()
-        self.results['whois'] = results
+        with self._results_lock:
+            self.results['whois'] = results
         return results
     
     def run_dns_enumeration(self):
         """Execute DNS enumeration module"""
+        from modules.dns_enum import DNSEnumerator
+        
         self.logger.info(f"Starting DNS enumeration for {self.target}")
         dns_enum = DNSEnumerator(self.target, self.logger)
         results = dns_enum.enumerate()
-        self.results['dns_enumeration'] = results
+        with self._results_lock:
+            self.results['dns_enumeration'] = results
         return results
     
     def run_full_scan(self):
         """Execute all reconnaissance modules"""
         self.logger.info(f"Starting full reconnaissance scan on {self.target}")
         
-        # Run all modules
-        self.run_whois_lookup()
-        self.run_dns_enumeration()
-        self.run_port_scan()
-        self.run_service_detection()
-        self.run_subdomain_discovery()
+        from modules.service_detector import DEFAULT_PORTS
+        
+        # Modules are network-bound, so run them concurrently. The executor is
+        # not used as a context manager: on Ctrl-C or a module error it must
+        # not join module threads that are still blocked on the network
+        executor = ThreadPoolExecutor(max_workers=5)
+        futures = []
+        
+        try:
+            port_scan = executor.submit(self.run_port_scan)
+            futures = [
+                executor.submit(self.run_whois_lookup),
+                executor.submit(self.run_dns_enumeration),
+                executor.submit(self.run_subdomain_discovery),
+                port_scan,
+            ]
+            
+            # Service detection starts once the scan is done and covers the
+            # ports it found open as well as the detector's defaults, which
+            # reach beyond the scan's 1-1000 range
+            open_ports = {entry['port'] for entry in port_scan.result()['open_ports']}
+            futures.append(executor.submit(self.run_service_detection, sorted(open_ports.union(DEFAULT_PORTS))))
+            
+            for future in futures:
+                future.result()
+        finally:
+            # Drop modules that have not started and return without waiting;
+            # on success every future is already done
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            
+            # Modules finish in any order; keep report sections in module order
+            with self._results_lock:
+                for key in _RESULT_ORDER:
+                    if key in self.results:
+                        self.results[key] = self.results.pop(key)
         
         return self.results
     
     def save_results(self, output_format="json"):
-        """Save results to file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.target.replace('.', '_')}_{timestamp}"
+        """Save results to file in one format, or to one file per format given as a list"""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        filename = f"{self.target.translate(_FNAME_TRANS)}_{timestamp}"
         
         output_handler = OutputHandler(self.output_dir)
-        filepath = output_handler.save(self.results, filename, output_format)
+        saved = output_handler.save(self.results, filename, output_format)
         
-        self.logger.success(f"Results saved to: {filepath}")
-        return filepath
+        for filepath in ([saved] if isinstance(saved, str) else saved):
+            self.logger.success(f"Results saved to: {filepath}")
+        return saved
 
 
 def main():
@@ -125,6 +179,9 @@ Examples:
   
   # Multiple modules with JSON output
   python spotter.py -t example.com --port-scan --dns-enum -o json
+  
+  # Save results in every format
+  python spotter.py -t example.com --full -o json xml txt
         """
     )
     
@@ -146,7 +203,7 @@ Examples:
     parser.add_argument("--specific-ports", help="Specific ports for service detection (comma-separated)")
     
     # Output options
-    parser.add_argument("-o", "--output-format", choices=["json", "xml", "txt"], default="json", help="Output format (default: json)")
+    parser.add_argument("-o", "--output-format", nargs="+", choices=["json", "xml", "txt"], default=["json"], help="Output format(s), e.g. -o json xml (default: json)")
     parser.add_argument("--output-dir", default="results", help="Output directory for results (default: results)")
     
     # General options
@@ -199,17 +256,26 @@ Examples:
         if not args.no_save:
             spotter.save_results(output_format=args.output_format)
         
+        spotter.logger.flush()
         print(f"\n{Fore.GREEN}[✓] Reconnaissance completed successfully!{Style.RESET_ALL}")
         
     except KeyboardInterrupt:
+        spotter.logger.flush()
         print(f"\n{Fore.YELLOW}[!] Scan interrupted by user{Style.RESET_ALL}")
-        sys.exit(0)
+        sys.stdout.flush()
+        # Module threads may still be blocked on the network, and normal
+        # interpreter exit would join them; leave without waiting
+        os._exit(0)
     except Exception as e:
+        spotter.logger.flush()
         print(f"{Fore.RED}[!] Error: {str(e)}{Style.RESET_ALL}")
         if args.verbose:
             import traceback
             traceback.print_exc()
-        sys.exit(1)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # As on Ctrl-C, don't wait for module threads still on the network
+        os._exit(1)
 
 
 if __name__ == "__main__":
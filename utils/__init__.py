@@ -2,4 +2,4 @@
 Spotter Utility Modules
 """
 
-__all__ = ['logger', 'output_handler', 'banner']
+__all__ = ['logger', 'output_handler', 'banner', 'dns_cache', 'uring']
@@ -3,12 +3,13 @@ Banner Module
 Displays ASCII art banner for Spotter
 """
 
+import sys
+
 from colorama import Fore, Style
 
 
-def print_banner():
-    """Print Spotter ASCII banner"""
-    banner = f"""
+# Built once at import time; ends with the newline print() used to add
+_BANNER = f"""
 {Fore.CYAN}
    _____ ____  ____  ______________________
   / ___// __ \\/ __ \\/_  __/_  __/ ____/ __ \\
@@ -19,5 +20,10 @@ def print_banner():
 {Fore.GREEN}Modular Reconnaissance Framework v1.0{Style.RESET_ALL}
 {Fore.YELLOW}Automated Enumeration & Vulnerability Scanner{Style.RESET_ALL}
 {Fore.MAGENTA}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}
-    """
-    print(banner)
+    \n"""
+
+
+def print_banner():
+    """Print Spotter ASCII banner"""
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
@@ -0,0 +1,163 @@
+"""
+DNS Cache Module
+Process-level TTL-aware cache for DNS answers shared by the recon modules
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import dns.resolver
+
+
+# Upper bound for how long a positive answer is kept, regardless of its TTL
+MAX_TTL = 3600
+
+# How long a non-existent name (NXDOMAIN) is remembered
+NEGATIVE_TTL = 60
+
+# Most entries kept; the least recently used ones are evicted beyond this
+MAX_ENTRIES = 10000
+
+# How often expired entries are swept out (seconds)
+SWEEP_INTERVAL = 60
+
+# (name, rdtype) -> (expiry, answer or _Negative marker), oldest use first
+_DNS_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_next_sweep = 0.0
+
+
+class _Negative:
+    """Cached NXDOMAIN entry; keeps the query names to raise a fresh exception per hit"""
+
+    def __init__(self, error):
+        # Only the names: the responses would pin a whole DNS message per miss
+        self.qnames = list(error.kwargs.get('qnames') or [])
+
+    def raise_error(self):
+        """Raise a new NXDOMAIN equivalent to the one that was cached"""
+        raise dns.resolver.NXDOMAIN(qnames=self.qnames)
+
+
+def _cache_key(name, rdtype):
+    """Build a normalized cache key"""
+    return (str(name).lower().rstrip('.'), str(rdtype).upper())
+
+
+def _lookup(key):
+    """Return a cached entry if it has not expired, otherwise None"""
+    with _CACHE_LOCK:
+        entry = _DNS_CACHE.get(key)
+        if entry is None:
+            return None
+
+        expiry, value = entry
+        if time.monotonic() < expiry:
+            _DNS_CACHE.move_to_end(key)
+            return value
+
+        del _DNS_CACHE[key]
+        return None
+
+
+def _insert(key, expiry, value):
+    """Add an entry, sweeping expired ones periodically and evicting the least recently used"""
+    global _next_sweep
+
+    with _CACHE_LOCK:
+        _DNS_CACHE[key] = (expiry, value)
+        _DNS_CACHE.move_to_end(key)
+
+        now = time.monotonic()
+        if now >= _next_sweep:
+            for stale in [k for k, (exp, _) in _DNS_CACHE.items() if exp <= now]:
+                del _DNS_CACHE[stale]
+            _next_sweep = now + SWEEP_INTERVAL
+
+        while len(_DNS_CACHE) > MAX_ENTRIES:
+            _DNS_CACHE.popitem(last=False)
+
+
+def _store(key, answer):
+    """Store a positive answer using its rrset TTL"""
+    ttl = min(answer.rrset.ttl, MAX_TTL) if answer.rrset is not None else 0
+    if ttl <= 0:
+        return
+
+    _insert(key, time.monotonic() + ttl, answer)
+
+
+def _store_negative(key, error):
+    """Remember a non-existent name for NEGATIVE_TTL seconds"""
+    _insert(key, time.monotonic() + NEGATIVE_TTL, _Negative(error))
+
+
+def cached_resolve(name, rdtype, lifetime=None):
+    """
+    Resolve a DNS name through the cache
+
+    Args:
+        name: Name to resolve
+        rdtype: Record type (e.g., "A", "NS")
+        lifetime: Optional resolver lifetime in seconds
+
+    Returns:
+        dns.resolver.Answer: Cached or freshly resolved answer
+
+    Raises:
+        dns.resolver.NXDOMAIN: If the name does not exist (cached negatively)
+    """
+    key = _cache_key(name, rdtype)
+
+    cached = _lookup(key)
+    if cached is not None:
+        if isinstance(cached, _Negative):
+            cached.raise_error()
+        return cached
+
+    try:
+        answer = dns.resolver.resolve(name, rdtype, lifetime=lifetime)
+    except dns.resolver.NXDOMAIN as e:
+        _store_negative(key, e)
+        raise
+
+    _store(key, answer)
+    return answer
+
+
+async def cached_resolve_async(resolver, name, rdtype, cache_negative=True):
+    """
+    Resolve a DNS name through the cache using an async resolver
+
+    Args:
+        resolver: dns.asyncresolver.Resolver instance
+        name: Name to resolve
+        rdtype: Record type (e.g., "A", "NS")
+        cache_negative: Whether to remember an NXDOMAIN answer; callers
+            probing names they will not ask for again can turn this off
+
+    Returns:
+        dns.resolver.Answer: Cached or freshly resolved answer
+
+    Raises:
+        dns.resolver.NXDOMAIN: If the name does not exist (cached negatively)
+    """
+    key = _cache_key(name, rdtype)
+
+    cached = _lookup(key)
+    if cached is not None:
+        if isinstance(cached, _Negative):
+            cached.raise_error()
+        return cached
+
+    try:
+        answer = await resolver.resolve(name, rdtype)
+    except dns.resolver.NXDOMAIN as e:
+        if cache_negative:
+            _store_negative(key, e)
+        raise
+
+    _store(key, answer)
+    return answer
+
@@ -3,8 +3,64 @@ Logger Module
 Provides colored logging functionality for Spotter
 """
 
+import atexit
+import sys
+import threading
+import time
+import weakref
+
 from colorama import Fore, Style
-from datetime import datetime
+
+
+# (epoch second, formatted "%H:%M:%S") of the last timestamp produced; swapped
+# as a whole tuple so concurrent loggers never see a mismatched pair
+_last_ts = (None, "")
+
+# Debug lines are buffered and written once this many are pending, or by a
+# timer at most this many seconds after the first one was buffered
+FLUSH_LINES = 64
+FLUSH_INTERVAL = 0.2
+
+# Live loggers, flushed once at exit without being kept alive by atexit
+_LOGGERS = weakref.WeakSet()
+
+# Only emit ANSI colors when writing to a terminal
+_USE_COLOR = sys.stdout.isatty()
+
+# Level name -> (color codes, tag) used to build the line templates
+_LEVELS = {
+    'info': (Fore.CYAN, '[*]'),
+    'success': (Fore.GREEN, '[✓]'),
+    'warning': (Fore.YELLOW, '[!]'),
+    'error': (Fore.RED, '[✗]'),
+    'debug': (Fore.MAGENTA, '[DEBUG]'),
+    'critical': (Fore.RED + Style.BRIGHT, '[CRITICAL]'),
+}
+
+
+def _ts():
+    """Return the current "%H:%M:%S" timestamp, formatting at most once per second"""
+    global _last_ts
+    
+    second = int(time.time())
+    cached_second, formatted = _last_ts
+    if second != cached_second:
+        formatted = time.strftime("%H:%M:%S", time.localtime(second))
+        _last_ts = (second, formatted)
+    return formatted
+
+
+def _noop(*args, **kwargs):
+    """Discard a log call"""
+
+
+def _flush_all():
+    """Write out the buffered lines of every live logger"""
+    for logger in list(_LOGGERS):
+        logger.flush()
+
+
+atexit.register(_flush_all)
 
 
 class Logger:
@@ -12,34 +68,74 @@ class Logger:
     
     def __init__(self, verbose=False):
         self.verbose = verbose
+        self._buf = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer = None
+        _LOGGERS.add(self)
+        
+        # Per-level "{timestamp} {message}" templates, built once; colors are
+        # left out entirely when not writing to a terminal
+        reset = Style.RESET_ALL if _USE_COLOR else ""
+        self._fmts = {
+            level: f"{color if _USE_COLOR else ''}[{{}}] {tag}{reset} {{}}"
+            for level, (color, tag) in _LEVELS.items()
+        }
+        
+        # Bind debug once so calls in non-verbose mode are a bare no-op
+        self.debug = self._debug_impl if verbose else _noop
+    
+    def _write(self, line, urgent=True):
+        """Queue a log line, writing the buffer out when urgent or a threshold is hit"""
+        with self._lock:
+            self._buf.append(line + "\n")
+            now = time.monotonic()
+            if urgent or len(self._buf) >= FLUSH_LINES or now - self._last_flush >= FLUSH_INTERVAL:
+                self._flush_locked(now)
+            elif self._timer is None:
+                # Write the line out even if nothing else is logged for a while
+                self._timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def _flush_locked(self, now):
+        """Write out buffered lines in one call; caller holds the lock"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        if self._buf:
+            # Look up sys.stdout on each flush so colorama's wrapper is honored
+            sys.stdout.write("".join(self._buf))
+            sys.stdout.flush()
+            self._buf.clear()
+        self._last_flush = now
+    
+    def flush(self):
+        """Write out any buffered log lines"""
+        with self._lock:
+            self._flush_locked(time.monotonic())
         
     def info(self, message):
         """Log info message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{Fore.CYAN}[{timestamp}] [*]{Style.RESET_ALL} {message}")
+        self._write(self._fmts['info'].format(_ts(), message))
     
     def success(self, message):
         """Log success message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{Fore.GREEN}[{timestamp}] [✓]{Style.RESET_ALL} {message}")
+        self._write(self._fmts['success'].format(_ts(), message))
     
     def warning(self, message):
         """Log warning message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{Fore.YELLOW}[{timestamp}] [!]{Style.RESET_ALL} {message}")
+        self._write(self._fmts['warning'].format(_ts(), message))
     
     def error(self, message):
         """Log error message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{Fore.RED}[{timestamp}] [✗]{Style.RESET_ALL} {message}")
+        self._write(self._fmts['error'].format(_ts(), message))
     
-    def debug(self, message):
-        """Log debug message (only in verbose mode)"""
-        if self.verbose:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"{Fore.MAGENTA}[{timestamp}] [DEBUG]{Style.RESET_ALL} {message}")
+    def _debug_impl(self, message):
+        """Log debug message; bound as debug() only in verbose mode"""
+        self._write(self._fmts['debug'].format(_ts(), message), urgent=False)
     
     def critical(self, message):
         """Log critical message"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{Fore.RED}{Style.BRIGHT}[{timestamp}] [CRITICAL]{Style.RESET_ALL} {message}")
+        self._write(self._fmts['critical'].format(_ts(), message))
@@ -5,10 +5,46 @@ Handles saving results in multiple formats (JSON, XML, TXT)
 
 import json
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+
+# Separators in result keys, mapped to underscores in XML tag names
+_XML_KEY_TRANS = str.maketrans({' ': '_', '-': '_'})
+
+# Any other character that cannot appear in an XML tag name
+_XML_NAME_INVALID = re.compile(r'[^\w.]')
+
+# Characters XML 1.0 cannot carry at all (e.g. control bytes in raw banners)
+_XML_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+@lru_cache(maxsize=1024)
+def _xml_tag(key):
+    """Turn a result key into a valid XML tag name"""
+    tag = _XML_NAME_INVALID.sub('_', key.translate(_XML_KEY_TRANS))
+    
+    # Names must start with a letter or underscore (e.g. not a digit)
+    if not tag or not (tag[0].isalpha() or tag[0] == '_'):
+        tag = '_' + tag
+    
+    return tag
+
 
 class OutputHandler:
     """Handles output formatting and file saving"""
@@ -17,36 +53,56 @@ class OutputHandler:
         self.output_dir = output_dir
         
         # Create output directory if it doesn't exist
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
     
-    def save(self, data, filename, format_type="json"):
+    def save(self, data, filename, format_types="json"):
         """
-        Save data to file in specified format
+        Save data to file in one or more formats
         
         Args:
             data: Data to save
             filename: Base filename (without extension)
-            format_type: Output format (json, xml, txt)
+            format_types: Output format (json, xml, txt) or a list of formats
         
         Returns:
-            str: Path to saved file
+            str: Path to saved file when a single format string is given
+            list: Paths to saved files, in order, when a list is given
         """
-        if format_type == "json":
-            return self._save_json(data, filename)
-        elif format_type == "xml":
-            return self._save_xml(data, filename)
-        elif format_type == "txt":
-            return self._save_txt(data, filename)
+        savers = {
+            "json": self._save_json,
+            "xml": self._save_xml,
+            "txt": self._save_txt,
+        }
+        
+        single = isinstance(format_types, str)
+        formats = [format_types] if single else list(dict.fromkeys(format_types))
+        
+        for format_type in formats:
+            if format_type not in savers:
+                raise ValueError(f"Unsupported format: {format_type}")
+        
+        if len(formats) == 1:
+            filepaths = [savers[formats[0]](data, filename)]
         else:
-            raise ValueError(f"Unsupported format: {format_type}")
+            # Each format writes its own file, so save them concurrently
+            with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+                futures = [executor.submit(savers[format_type], data, filename) for format_type in formats]
+                filepaths = [future.result() for future in futures]
+        
+        return filepaths[0] if single else filepaths
     
     def _save_json(self, data, filename):
         """Save data as JSON"""
         filepath = os.path.join(self.output_dir, f"{filename}.json")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        if orjson is not None:
+            # Pass datetimes through to default=str so they render as with json
+            options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, default=str, option=options))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, default=str)
         
         return filepath
     
@@ -54,17 +110,37 @@ class OutputHandler:
         """Save data as XML"""
         filepath = os.path.join(self.output_dir, f"{filename}.xml")
         
+        if LET is not None:
+            try:
+                root = LET.Element('SpotterResults')
+                self._dict_to_xml(root, data, LET)
+            except ValueError:
+                # lxml is stricter than _xml_tag about some non-ASCII names;
+                # build those with the stdlib below
+                pass
+            else:
+                # Pretty print and write in a single C-level call
+                LET.ElementTree(root).write(filepath, encoding='utf-8', xml_declaration=True, pretty_print=True)
+                return filepath
+        
         # Create root element
         root = ET.Element('SpotterResults')
         
         # Convert dict to XML
         self._dict_to_xml(root, data)
         
-        # Pretty print XML
-        xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
+        tree = ET.ElementTree(root)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(xml_str)
+        if hasattr(ET, 'indent'):
+            # Pretty print in place and write straight to the file (Python 3.9+)
+            ET.indent(tree, space="  ")
+            tree.write(filepath, encoding='utf-8', xml_declaration=True)
+        else:
+            # Older Pythons have no ET.indent; pretty print through minidom
+            xml_str = minidom.parseString(ET.tostring(root)).toprettyxml(indent="  ")
+            
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(xml_str)
         
         return filepath
     
@@ -72,54 +148,77 @@ class OutputHandler:
         """Save data as formatted text"""
         filepath = os.path.join(self.output_dir, f"{filename}.txt")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("SPOTTER RECONNAISSANCE REPORT\n")
-            f.write("=" * 80 + "\n\n")
-            
-            self._write_dict_as_text(f, data)
+        parts = [
+            "=" * 80 + "\n",
+            "SPOTTER RECONNAISSANCE REPORT\n",
+            "=" * 80 + "\n\n",
+        ]
+        self._dict_to_text(parts, data)
+        
+        # Write the whole report at once through a large buffer
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(parts)
         
         return filepath
     
-    def _dict_to_xml(self, parent, data):
-        """Recursively convert dictionary to XML elements"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                # Sanitize key for XML
-                key = str(key).replace(' ', '_').replace('-', '_')
+    def _dict_to_xml(self, parent, data, etree=ET):
+        """Convert dictionary to XML elements, walking it with an explicit stack"""
+        # Children are created in order when their parent is visited, so the
+        # stack's visiting order does not affect the document order
+        stack = deque([(parent, data)])
+        
+        while stack:
+            element, node = stack.pop()
+            
+            if not isinstance(node, dict):
+                element.text = _XML_INVALID_CHARS.sub('', str(node))
+                continue
+            
+            for key, value in node.items():
+                child = etree.SubElement(element, _xml_tag(str(key)))
                 
                 if isinstance(value, list):
-                    list_elem = ET.SubElement(parent, key)
                     for item in value:
-                        item_elem = ET.SubElement(list_elem, 'item')
-                        self._dict_to_xml(item_elem, item)
+                        stack.append((etree.SubElement(child, 'item'), item))
                 elif isinstance(value, dict):
-                    child = ET.SubElement(parent, key)
-                    self._dict_to_xml(child, value)
+                    stack.append((child, value))
                 else:
-                    child = ET.SubElement(parent, key)
-                    child.text = str(value)
-        else:
-            parent.text = str(data)
+                    child.text = _XML_INVALID_CHARS.sub('', str(value))
     
-    def _write_dict_as_text(self, f, data, indent=0):
-        """Recursively write dictionary as formatted text"""
-        indent_str = "  " * indent
+    def _dict_to_text(self, parts, data, indent=0):
+        """Append dictionary as formatted text lines to parts, walking it with an explicit stack"""
+        # Entries are either a finished line or a (node, indent) pair still to
+        # expand; children are pushed in reverse so they pop in document order
+        stack = deque([(data, indent)])
         
-        if isinstance(data, dict):
-            for key, value in data.items():
+        while stack:
+            entry = stack.pop()
+            
+            if isinstance(entry, str):
+                parts.append(entry)
+                continue
+            
+            node, level = entry
+            indent_str = "  " * level
+            
+            if not isinstance(node, dict):
+                parts.append(f"{indent_str}{node}\n")
+                continue
+            
+            pending = []
+            for key, value in node.items():
                 if isinstance(value, dict):
-                    f.write(f"{indent_str}{key}:\n")
-                    self._write_dict_as_text(f, value, indent + 1)
+                    pending.append(f"{indent_str}{key}:\n")
+                    pending.append((value, level + 1))
                 elif isinstance(value, list):
-                    f.write(f"{indent_str}{key}:\n")
+                    pending.append(f"{indent_str}{key}:\n")
                     for i, item in enumerate(value, 1):
                         if isinstance(item, dict):
-                            f.write(f"{indent_str}  [{i}]\n")
-                            self._write_dict_as_text(f, item, indent + 2)
+                            pending.append(f"{indent_str}  [{i}]\n")
+                            pending.append((item, level + 2))
                         else:
-                            f.write(f"{indent_str}  - {item}\n")
+                            pending.append(f"{indent_str}  - {item}\n")
                 else:
-                    f.write(f"{indent_str}{key}: {value}\n")
-        else:
-            f.write(f"{indent_str}{data}\n")
+                    pending.append(f"{indent_str}{key}: {value}\n")
+            
+            stack.extend(reversed(pending))